@@ -3,11 +3,29 @@ Script to count documents and pages per client/folder.
 Supports PDF and Word documents (.docx, .doc)
 """
 
+import io
 import os
+import html
+import sys
+import csv
+import re
+import mmap
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter
 import json
 from datetime import datetime
+from itertools import chain
+from operator import itemgetter
+
+# PDFs smaller than this are read into memory in one call; larger ones are mmap'd
+PDF_PREFETCH_LIMIT = 8 << 20
+# Size of the region at the end of a PDF that holds the xref table and trailer
+PDF_TAIL_SIZE = 64 << 10
 
 # Try to import PDF library
 try:
@@ -22,53 +40,368 @@ except ImportError:
         print("Warning: pypdf or PyPDF2 not installed. PDF page counting will be unavailable.")
         print("Install with: pip install pypdf")
 
-# Try to import docx library
+# pikepdf (libqpdf) is optional and only used as a faster page-count path
+try:
+    import pikepdf
+    PIKEPDF_SUPPORT = True
+except ImportError:
+    PIKEPDF_SUPPORT = False
+
+# orjson is optional; reports fall back to the stdlib json module
 try:
-    from docx import Document
-    DOCX_SUPPORT = True
+    import orjson
+    ORJSON_SUPPORT = True
 except ImportError:
-    DOCX_SUPPORT = False
-    print("Warning: python-docx not installed. DOCX page counting will be unavailable.")
-    print("Install with: pip install python-docx")
+    ORJSON_SUPPORT = False
+
+CSV_HEADER = ["Client Folder", "PDF Count", "DOCX Count", "Total Documents",
+              "PDF Pages", "DOCX Pages (est)", "Total Pages"]
+
+# Patterns for reading the page count directly from the end of a PDF
+PDF_STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+PDF_ROOT_RE = re.compile(rb'/Root\s+(\d+)\s+(\d+)\s+R')
+PDF_PREV_RE = re.compile(rb'/Prev\s+(\d+)')
+PDF_PAGES_REF_RE = re.compile(rb'/Pages\s+(\d+)\s+(\d+)\s+R')
+# Direct integers only - an indirect /Count ("/Count 3 0 R") is left to the PDF readers
+PDF_COUNT_RE = re.compile(rb'/Count\s+(\d+)\b(?!\s+\d+\s+R)')
+# Cross-reference/object streams can hold newer objects than any plain-text copy in the tail
+PDF_COMPRESSED_XREF_RE = re.compile(rb'/Type\s*/XRef\b|/ObjStm\b|/XRefStm\b')
+
+# DOCX page estimation reads word/document.xml straight out of the zip
+DOCX_RENDERED_BREAK = b'<w:lastRenderedPageBreak/>'
+DOCX_PAGE_BREAK_RE = re.compile(rb'<w:br\b[^>]*\bw:type="page"')
+DOCX_TEXT_RE = re.compile(rb'<w:t(?:\s[^>]*)?>([^<]*)</w:t>')
+
+
+@contextmanager
+def _open_pdf_stream(file_path: str, size: int):
+    """
+    Yield an in-memory, seekable view of a PDF so the reader's many small seeks/reads
+    don't each hit the disk. Small files are read in one go; larger ones are mmap'd.
+    """
+    with open(file_path, 'rb') as f:
+        if size < PDF_PREFETCH_LIMIT:
+            yield io.BytesIO(f.read())
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Faults on the mapping follow its own advice, not the fd's. Random access
+                # stops readahead from pulling the whole file into the page cache. The tail
+                # (xref/trailer) is already cached by _count_pdf_pages_from_tail.
+                if hasattr(mmap, 'MADV_RANDOM'):
+                    mm.madvise(mmap.MADV_RANDOM)
+                yield mm
+
+
+def _xref_trailer(tail: bytes, tail_start: int, xref_pos: int):
+    """
+    Return (entries, trailer) for the classic xref section at file offset xref_pos, where
+    entries is the raw table text. None if the section isn't a classic table inside the tail.
+    """
+    rel = xref_pos - tail_start
+    if rel < 0 or not tail.startswith(b'xref', rel):
+        return None
+    trailer_pos = tail.find(b'trailer', rel)
+    if trailer_pos < 0:
+        return None
+    trailer_end = tail.find(b'startxref', trailer_pos)
+    return tail[rel + 4:trailer_pos], tail[trailer_pos:trailer_end if trailer_end >= 0 else None]
+
+
+def _read_tail_object(tail: bytes, tail_start: int, xref_pos: int, obj_num: int, gen: int):
+    """
+    Resolve an object through the classic xref chain (newest section first, then /Prev)
+    and return its body, or None if any step falls outside the tail.
+    """
+    visited = set()
+    while xref_pos not in visited:
+        visited.add(xref_pos)
+        section = _xref_trailer(tail, tail_start, xref_pos)
+        if section is None:
+            return None
+        entries, trailer = section
+        
+        tokens = entries.split()
+        i = 0
+        while i + 1 < len(tokens):
+            first, count = int(tokens[i]), int(tokens[i + 1])
+            i += 2
+            if first <= obj_num < first + count:
+                offset, entry_gen, kind = tokens[i + 3 * (obj_num - first):i + 3 * (obj_num - first) + 3]
+                if kind != b'n' or int(entry_gen) != gen:
+                    return None
+                rel = int(offset) - tail_start
+                header = re.compile(rb'\s*%d\s+%d\s+obj\b' % (obj_num, gen))
+                end = tail.find(b'endobj', rel)
+                if rel < 0 or end < 0 or not header.match(tail, rel):
+                    return None
+                return tail[rel:end]
+            i += 3 * count
+        
+        prev = PDF_PREV_RE.search(trailer)
+        if not prev:
+            return None
+        xref_pos = int(prev.group(1))
+    return None
 
 
-def count_pdf_pages(file_path: str) -> int:
-    """Count the number of pages in a PDF file."""
+def _count_pdf_pages_from_tail(file_path: str, size: int):
+    """
+    Read /Count straight from the last PDF_TAIL_SIZE bytes of the file, without a PDF parser.
+    Follows the final trailer's /Root to the catalog and its /Pages to the root Pages object,
+    resolving both through the classic xref table(s) in the tail. Returns None whenever that
+    isn't possible (xref/object streams, objects before the tail, indirect /Count) so the
+    caller can fall back to a real PDF reader.
+    """
+    tail_start = max(0, size - PDF_TAIL_SIZE)
+    with open(file_path, 'rb') as f:
+        f.seek(tail_start)
+        tail = f.read()
+    
+    if PDF_COMPRESSED_XREF_RE.search(tail):
+        return None
+    startxrefs = PDF_STARTXREF_RE.findall(tail)
+    if not startxrefs:
+        return None
+    xref_pos = int(startxrefs[-1])
+    
+    try:
+        section = _xref_trailer(tail, tail_start, xref_pos)
+        if section is None:
+            return None
+        root = PDF_ROOT_RE.search(section[1])
+        if not root:
+            return None
+        catalog = _read_tail_object(tail, tail_start, xref_pos, int(root.group(1)), int(root.group(2)))
+        if catalog is None:
+            return None
+        pages_ref = PDF_PAGES_REF_RE.search(catalog)
+        if not pages_ref:
+            return None
+        pages = _read_tail_object(tail, tail_start, xref_pos, int(pages_ref.group(1)), int(pages_ref.group(2)))
+    except (ValueError, IndexError):
+        # Malformed xref table
+        return None
+    if pages is None:
+        return None
+    count = PDF_COUNT_RE.search(pages)
+    return int(count.group(1)) if count else None
+
+
+def count_pdf_pages(file_path: str, st: os.stat_result = None) -> int:
+    """
+    Count the number of pages in a PDF file.
+    Reads /Count from the top-level /Pages node instead of walking the whole page tree.
+    Pass the file's stat result from the directory walk to avoid stat-ing it again.
+    """
+    size = st.st_size if st is not None else os.path.getsize(file_path)
+    try:
+        pages = _count_pdf_pages_from_tail(file_path, size)
+        if pages is not None:
+            return pages
+    except OSError:
+        pass
+    
+    if PIKEPDF_SUPPORT:
+        try:
+            with pikepdf.open(file_path) as pdf:
+                return int(pdf.Root.Pages.Count)
+        except Exception as e:
+            if not PDF_SUPPORT:
+                print(f"  Warning: Could not read PDF '{file_path}': {e}")
+                return 0
     if not PDF_SUPPORT:
         return 0
     try:
-        reader = PdfReader(file_path)
-        return len(reader.pages)
+        with _open_pdf_stream(file_path, size) as stream:
+            reader = PdfReader(stream, strict=False)
+            try:
+                return int(reader.trailer["/Root"]["/Pages"]["/Count"])
+            except (KeyError, TypeError, ValueError):
+                # Missing or malformed /Count - let the reader rebuild the page tree
+                return len(reader.pages)
     except Exception as e:
         print(f"  Warning: Could not read PDF '{file_path}': {e}")
         return 0
 
 
-def count_docx_pages(file_path: str) -> int:
+def count_docx_pages(file_path: str, st: os.stat_result = None) -> int:
     """
     Estimate the number of pages in a DOCX file.
     Note: DOCX files don't have a fixed page count - it depends on rendering.
-    This estimates based on paragraph breaks and content.
+    Uses the page breaks Word records when it last rendered the document, and otherwise
+    falls back to explicit page breaks and a character-count estimate (~3000 chars per page).
     """
-    if not DOCX_SUPPORT:
-        return 0
     try:
-        doc = Document(file_path)
-        # Count total paragraphs and estimate pages
-        # Average ~25-30 paragraphs per page is a rough estimate
-        total_paragraphs = len(doc.paragraphs)
-        # More accurate: count characters and estimate (~3000 chars per page)
-        total_chars = sum(len(p.text) for p in doc.paragraphs)
-        estimated_pages = max(1, total_chars // 3000) if total_chars > 0 else 1
-        return estimated_pages
+        with zipfile.ZipFile(file_path) as z:
+            xml = z.read('word/document.xml')
+        
+        rendered_breaks = xml.count(DOCX_RENDERED_BREAK)
+        if rendered_breaks:
+            return rendered_breaks + 1
+        
+        # Never rendered by Word (e.g. generated files) - estimate from content
+        page_breaks = len(DOCX_PAGE_BREAK_RE.findall(xml))
+        # Measure characters, not UTF-8 bytes or XML entities, so ~3000 chars/page holds
+        total_chars = sum(
+            len(html.unescape(text.decode('utf-8', errors='replace')))
+            for text in DOCX_TEXT_RE.findall(xml)
+        )
+        return max(1, page_breaks + 1, total_chars // 3000)
     except Exception as e:
         print(f"  Warning: Could not read DOCX '{file_path}': {e}")
         return 0
 
 
-def analyze_folder(root_path: str) -> dict:
+def iter_files(path: str):
+    """
+    Recursively yield os.DirEntry objects for every file under path.
+    Directories or entries that can't be read are reported and skipped, like os.walk does.
+    """
+    try:
+        it = os.scandir(path)
+    except OSError as e:
+        print(f"  Warning: Could not read folder '{path}': {e}")
+        return
+    with it:
+        while True:
+            try:
+                entry = next(it)
+            except StopIteration:
+                return
+            except OSError as e:
+                print(f"  Warning: Could not read folder '{path}': {e}")
+                return
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from iter_files(entry.path)
+                elif entry.is_file():
+                    yield entry
+            except OSError as e:
+                print(f"  Warning: Could not read '{entry.path}': {e}")
+
+
+def iter_work(client_folders: list):
+    """
+    Walk every client folder and yield (client_name, relative_path, absolute_path, ext, stat)
+    work items for supported documents. Each file is stat'd exactly once.
+    """
+    for client_folder in client_folders:
+        client_name = client_folder.name
+        client_path = os.path.abspath(client_folder)
+        for entry in iter_files(client_path):
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext not in EXT_HANDLERS:
+                continue
+            try:
+                st = entry.stat()
+            except OSError as e:
+                # e.g. deleted mid-walk
+                print(f"  Warning: Could not read '{entry.path}': {e}")
+                continue
+            relative_path = os.path.relpath(entry.path, client_path)
+            yield (client_name, relative_path, entry.path, ext, st)
+
+
+def skip_doc_pages(file_path: str, st: os.stat_result = None) -> int:
+    """Legacy binary .doc files aren't zip packages, so their pages aren't counted."""
+    print(f"  Note: .doc file skipped for page count: {os.path.basename(file_path)}")
+    return 0
+
+
+# Page counter for each supported document extension
+EXT_HANDLERS = {
+    '.pdf': count_pdf_pages,
+    '.docx': count_docx_pages,
+    '.doc': skip_doc_pages,
+}
+
+
+def _count_pages(meta: tuple) -> int:
+    """
+    Count pages for a single (client_name, relative_path, absolute_path, ext, stat) work item.
+    Defined at module level so it can be pickled for the process pool.
+    """
+    _, _, file_path, ext, st = meta
+    return EXT_HANDLERS[ext](file_path, st)
+
+
+@dataclass(slots=True)
+class ClientStats:
+    """Document and page counts for one client folder."""
+    pdf_count: int = 0
+    docx_count: int = 0
+    pdf_pages: int = 0
+    docx_pages: int = 0
+    total_documents: int = 0
+    total_pages: int = 0
+    # Per-file page counts, only collected for detailed reports
+    pdf_files: list | None = None
+    docx_files: list | None = None
+    
+    def to_dict(self) -> dict:
+        """Convert to the report's dict shape, leaving out per-file lists that weren't collected."""
+        stats = {}
+        # Per-file lists come first, matching the original report layout. Files are recorded
+        # in completion order (cache hits, then largest first), so sort them for the report.
+        if self.pdf_files is not None:
+            stats["pdf_files"] = sorted(self.pdf_files, key=itemgetter("file"))
+            stats["docx_files"] = sorted(self.docx_files, key=itemgetter("file"))
+        stats.update({
+            "pdf_count": self.pdf_count,
+            "docx_count": self.docx_count,
+            "pdf_pages": self.pdf_pages,
+            "docx_pages": self.docx_pages,
+            "total_documents": self.total_documents,
+            "total_pages": self.total_pages
+        })
+        return stats
+
+
+@dataclass(slots=True)
+class TotalStats:
+    """Document and page counts summed over all client folders."""
+    total_pdf_files: int = 0
+    total_docx_files: int = 0
+    total_pdf_pages: int = 0
+    total_docx_pages: int = 0
+    total_documents: int = 0
+    total_pages: int = 0
+    
+    def add(self, client_stats: ClientStats):
+        """Add one client's counts to the totals."""
+        self.total_pdf_files += client_stats.pdf_count
+        self.total_docx_files += client_stats.docx_count
+        self.total_pdf_pages += client_stats.pdf_pages
+        self.total_docx_pages += client_stats.docx_pages
+        self.total_documents += client_stats.total_documents
+        self.total_pages += client_stats.total_pages
+
+
+def default_jobs() -> int:
+    """Default worker count: the CPU count, capped at the 61 workers Windows allows per pool."""
+    jobs = os.cpu_count() or 1
+    if sys.platform == 'win32':
+        jobs = min(jobs, 61)
+    return jobs
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be a whole number >= 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def analyze_folder(root_path: str, jobs: int = None, cache: dict = None, detailed: bool = False,
+                   csv_file=None) -> dict:
     """
     Analyze the folder structure and count documents/pages per client folder.
+    Page counting is spread across `jobs` worker processes (defaults to the CPU count).
+    If a page-count cache is given, unchanged files are served from it and new counts
+    are written back into it. Per-file page lists are only kept when `detailed` is set.
+    If an open `csv_file` is given, each client's CSV row is written as soon as all of its
+    files are counted (so rows are in completion order, not sorted), followed by the total row.
     
     Returns a dictionary with client folder stats.
     """
@@ -78,14 +411,7 @@ def analyze_folder(root_path: str) -> dict:
         raise FileNotFoundError(f"Path does not exist: {root_path}")
     
     results = {}
-    total_stats = {
-        "total_pdf_files": 0,
-        "total_docx_files": 0,
-        "total_pdf_pages": 0,
-        "total_docx_pages": 0,
-        "total_documents": 0,
-        "total_pages": 0
-    }
+    total_stats = TotalStats()
     
     # Get all client folders (immediate subdirectories)
     client_folders = [f for f in root_path.iterdir() if f.is_dir()]
@@ -94,78 +420,128 @@ def analyze_folder(root_path: str) -> dict:
     print("=" * 80)
     
     for client_folder in sorted(client_folders):
-        client_name = client_folder.name
-        print(f"\nProcessing: {client_name}")
-        
-        client_stats = {
-            "pdf_files": [],
-            "docx_files": [],
-            "pdf_count": 0,
-            "docx_count": 0,
-            "pdf_pages": 0,
-            "docx_pages": 0,
-            "total_documents": 0,
-            "total_pages": 0
-        }
+        results[client_folder.name] = (
+            ClientStats(pdf_files=[], docx_files=[]) if detailed else ClientStats()
+        )
+    
+    def record(meta: tuple, pages: int):
+        client_name, relative_path, _, ext, _ = meta
+        client_stats = results[client_name]
         
-        # Walk through all subdirectories of this client folder
-        for root, dirs, files in os.walk(client_folder):
-            for file in files:
-                file_path = Path(root) / file
-                relative_path = file_path.relative_to(client_folder)
-                
-                # Check for PDF files
-                if file.lower().endswith('.pdf'):
-                    pages = count_pdf_pages(str(file_path))
-                    client_stats["pdf_files"].append({
-                        "file": str(relative_path),
-                        "pages": pages
-                    })
-                    client_stats["pdf_count"] += 1
-                    client_stats["pdf_pages"] += pages
-                
-                # Check for Word documents
-                elif file.lower().endswith(('.docx', '.doc')):
-                    if file.lower().endswith('.docx'):
-                        pages = count_docx_pages(str(file_path))
-                    else:
-                        # .doc files can't be read with python-docx
-                        pages = 0
-                        print(f"  Note: .doc file skipped for page count: {file}")
-                    
-                    client_stats["docx_files"].append({
-                        "file": str(relative_path),
-                        "pages": pages
-                    })
-                    client_stats["docx_count"] += 1
-                    client_stats["docx_pages"] += pages
+        if ext == '.pdf':
+            if detailed:
+                client_stats.pdf_files.append({"file": relative_path, "pages": pages})
+            client_stats.pdf_count += 1
+            client_stats.pdf_pages += pages
+        else:
+            if detailed:
+                client_stats.docx_files.append({"file": relative_path, "pages": pages})
+            client_stats.docx_count += 1
+            client_stats.docx_pages += pages
+    
+    work = []
+    seen = set()
+    # Walk everything first: largest-first scheduling below needs the complete work list
+    for meta in iter_work(sorted(client_folders)):
+        _, _, file_path, ext, st = meta
+        if ext == '.doc':
+            # Nothing to parse, so don't spend a pool slot (or a cache entry) on it
+            record(meta, skip_doc_pages(file_path, st))
+            continue
+        if cache is not None:
+            seen.add(file_path)
+            cached = cache.get(file_path)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                record(meta, cached[2])
+                continue
+        work.append(meta)
+    
+    if cache is not None:
+        # Forget files that are gone (or no longer under the analyzed folder)
+        for stale_path in cache.keys() - seen:
+            del cache[stale_path]
+    
+    if csv_file is not None:
+        csv_writer = csv.writer(csv_file, lineterminator='\n')
+        csv_writer.writerow(CSV_HEADER)
+    
+    def finish(client_name: str):
+        client_stats = results[client_name]
+        print(f"\nFinished: {client_name}")
         
         # Calculate totals for this client
-        client_stats["total_documents"] = client_stats["pdf_count"] + client_stats["docx_count"]
-        client_stats["total_pages"] = client_stats["pdf_pages"] + client_stats["docx_pages"]
-        
-        results[client_name] = client_stats
+        client_stats.total_documents = client_stats.pdf_count + client_stats.docx_count
+        client_stats.total_pages = client_stats.pdf_pages + client_stats.docx_pages
         
         # Update global totals
-        total_stats["total_pdf_files"] += client_stats["pdf_count"]
-        total_stats["total_docx_files"] += client_stats["docx_count"]
-        total_stats["total_pdf_pages"] += client_stats["pdf_pages"]
-        total_stats["total_docx_pages"] += client_stats["docx_pages"]
-        total_stats["total_documents"] += client_stats["total_documents"]
-        total_stats["total_pages"] += client_stats["total_pages"]
+        total_stats.add(client_stats)
+        
+        print(f"  PDFs: {client_stats.pdf_count} ({client_stats.pdf_pages} pages)")
+        print(f"  Word: {client_stats.docx_count} ({client_stats.docx_pages} pages estimated)")
+        print(f"  Total: {client_stats.total_documents} documents, {client_stats.total_pages} pages")
         
-        print(f"  PDFs: {client_stats['pdf_count']} ({client_stats['pdf_pages']} pages)")
-        print(f"  Word: {client_stats['docx_count']} ({client_stats['docx_pages']} pages estimated)")
-        print(f"  Total: {client_stats['total_documents']} documents, {client_stats['total_pages']} pages")
+        if csv_file is not None:
+            csv_writer.writerow(_client_csv_row(client_name, client_stats.to_dict()))
+            csv_file.flush()
+    
+    # Clients are finished as soon as their last uncached file is counted
+    pending = Counter(meta[0] for meta in work)
+    for client_name in results:
+        if not pending[client_name]:
+            finish(client_name)
+    
+    # Largest files first so one worker isn't left finishing a huge PDF after the rest are idle.
+    # The big head goes out one item at a time; the small-file tail is batched.
+    work.sort(key=lambda meta: meta[4].st_size, reverse=True)
+    workers = jobs or default_jobs()
+    head, tail = work[:workers * 4], work[workers * 4:]
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        page_counts = chain(
+            executor.map(_count_pages, head, chunksize=1),
+            executor.map(_count_pages, tail, chunksize=32),
+        )
+        for meta, pages in zip(work, page_counts):
+            record(meta, pages)
+            # Failed reads report 0 pages; leave them uncached so they're retried next run
+            _, _, file_path, _, st = meta
+            if cache is not None and pages:
+                cache[file_path] = [st.st_size, st.st_mtime_ns, pages]
+            pending[meta[0]] -= 1
+            if not pending[meta[0]]:
+                finish(meta[0])
+    
+    summary = asdict(total_stats)
+    if csv_file is not None:
+        csv_writer.writerow(_total_csv_row(summary))
+        csv_file.flush()
     
     return {
-        "clients": results,
-        "summary": total_stats,
+        "clients": {client_name: stats.to_dict() for client_name, stats in results.items()},
+        "summary": summary,
         "analyzed_path": str(root_path),
         "analyzed_at": datetime.now().isoformat()
     }
 
 
+def load_page_cache(cache_path: str) -> dict:
+    """
+    Load the page-count cache: {absolute_path: [size, mtime_ns, pages]}.
+    A missing or unreadable cache just means everything gets counted again.
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_page_cache(cache: dict, cache_path: str):
+    """Persist the page-count cache for the next run."""
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+
+
 def print_summary(results: dict):
     """Print a formatted summary of the analysis."""
     print("\n" + "=" * 80)
@@ -203,52 +579,98 @@ def print_summary(results: dict):
 
 def save_detailed_report(results: dict, output_path: str):
     """Save detailed results to a JSON file."""
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
-    print(f"\nDetailed report saved to: {output_path}")
+    if ORJSON_SUPPORT:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def _client_csv_row(client_name: str, stats: dict) -> list:
+    """Build the CSV row for one client's stats."""
+    return [client_name, stats['pdf_count'], stats['docx_count'], stats['total_documents'],
+            stats['pdf_pages'], stats['docx_pages'], stats['total_pages']]
+
+
+def _total_csv_row(summary: dict) -> list:
+    """Build the CSV total row from the summary stats."""
+    return ["TOTAL", summary['total_pdf_files'], summary['total_docx_files'], summary['total_documents'],
+            summary['total_pdf_pages'], summary['total_docx_pages'], summary['total_pages']]
 
 
 def save_csv_report(results: dict, output_path: str):
-    """Save summary to a CSV file."""
-    with open(output_path, 'w', encoding='utf-8') as f:
-        # Header
-        f.write("Client Folder,PDF Count,DOCX Count,Total Documents,PDF Pages,DOCX Pages (est),Total Pages\n")
-        
-        for client_name, stats in sorted(results["clients"].items()):
-            # Escape commas in client names
-            safe_name = f'"{client_name}"' if ',' in client_name else client_name
-            f.write(f"{safe_name},{stats['pdf_count']},{stats['docx_count']},{stats['total_documents']},"
-                   f"{stats['pdf_pages']},{stats['docx_pages']},{stats['total_pages']}\n")
-        
-        # Total row
-        summary = results["summary"]
-        f.write(f"TOTAL,{summary['total_pdf_files']},{summary['total_docx_files']},{summary['total_documents']},"
-               f"{summary['total_pdf_pages']},{summary['total_docx_pages']},{summary['total_pages']}\n")
+    """
+    Save summary to a CSV file in one go.
+    Used when the CSV wasn't streamed during analyze_folder.
+    """
+    rows = [
+        _client_csv_row(client_name, stats)
+        for client_name, stats in sorted(results["clients"].items())
+    ]
+    rows.append(_total_csv_row(results["summary"]))
     
-    print(f"CSV report saved to: {output_path}")
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(CSV_HEADER)
+        writer.writerows(rows)
 
 
 if __name__ == "__main__":
     # Configuration
     TARGET_PATH = r"E:\f\Brdge AI-Projects\drive-download-20250903T145611Z-1-001"
     
+    parser = argparse.ArgumentParser(description="Count documents and pages per client folder.")
+    parser.add_argument("--jobs", type=_positive_int, default=None,
+                        help="Number of worker processes for page counting (default: CPU count)")
+    parser.add_argument("--detailed", action="store_true",
+                        help="Include per-file page counts in the JSON report")
+    parser.add_argument("--stream-csv", action="store_true",
+                        help="Write each client's CSV row as soon as it is counted (rows are unsorted; "
+                             "the report is written to a .tmp file and moved into place when done)")
+    args = parser.parse_args()
+    
     # Output paths
     OUTPUT_DIR = Path(__file__).parent / "output"
     OUTPUT_DIR.mkdir(exist_ok=True)
     
     JSON_OUTPUT = OUTPUT_DIR / "document_count_report.json"
     CSV_OUTPUT = OUTPUT_DIR / "document_count_report.csv"
+    CACHE_PATH = OUTPUT_DIR / "pagecount_cache.json"
     
     try:
-        # Run analysis
-        results = analyze_folder(TARGET_PATH)
+        # Run analysis, reusing page counts for files unchanged since the last run
+        page_cache = load_page_cache(str(CACHE_PATH))
+        if args.stream_csv:
+            # Stream into a temp file so a failed run doesn't clobber the previous report
+            csv_tmp = CSV_OUTPUT.with_name(CSV_OUTPUT.name + ".tmp")
+            try:
+                with open(csv_tmp, 'w', encoding='utf-8', newline='', buffering=1 << 20) as csv_file:
+                    results = analyze_folder(TARGET_PATH, jobs=args.jobs, cache=page_cache,
+                                             detailed=args.detailed, csv_file=csv_file)
+                os.replace(csv_tmp, CSV_OUTPUT)
+            finally:
+                if csv_tmp.exists():
+                    csv_tmp.unlink()
+        else:
+            results = analyze_folder(TARGET_PATH, jobs=args.jobs, cache=page_cache,
+                                     detailed=args.detailed)
         
-        # Print summary
-        print_summary(results)
+        # Save reports and the cache in the background while the summary prints
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            writes = [
+                executor.submit(save_detailed_report, results, str(JSON_OUTPUT)),
+                executor.submit(save_page_cache, page_cache, str(CACHE_PATH)),
+            ]
+            if not args.stream_csv:
+                writes.append(executor.submit(save_csv_report, results, str(CSV_OUTPUT)))
+            print_summary(results)
+            for write in writes:
+                write.result()
         
-        # Save reports
-        save_detailed_report(results, str(JSON_OUTPUT))
-        save_csv_report(results, str(CSV_OUTPUT))
+        # Reported only now so the writer threads don't interleave with the summary
+        print(f"\nDetailed report saved to: {JSON_OUTPUT}")
+        print(f"CSV report saved to: {CSV_OUTPUT}")
         
         print("\nAnalysis complete!")
         
@@ -1,9 +1,22 @@
+import copy
 import json
 import sys
 
+# orjson is optional; fall back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SCHEMA_PATH = 'e:/f/Brdge AI-Projects/data lab/Data-Lab-Extraction/nest-reducto/schemas/cfr.json'
+
 # Read the current CFR schema
-with open('e:/f/Brdge AI-Projects/data lab/Data-Lab-Extraction/nest-reducto/schemas/cfr.json', 'r', encoding='utf-8') as f:
-    schema = json.load(f)
+if orjson:
+    with open(SCHEMA_PATH, 'rb') as f:
+        schema = orjson.loads(f.read())
+else:
+    with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
 
 # Define which sections are client-specific (to be duplicated)
 client_specific_sections = [
@@ -48,21 +61,32 @@ new_schema = {
     }
 }
 
-# Move client-specific sections to client_1 and client_2
-for section in client_specific_sections:
-    if section in schema['properties']:
-        new_schema['properties']['client_1']['properties'][section] = schema['properties'][section]
-        # Duplicate for client_2
-        new_schema['properties']['client_2']['properties'][section] = schema['properties'][section]
+# Move client-specific sections to client_1, and give client_2 its own copy so the
+# two clients' schemas never share (and mutate) the same objects
+client_props = {
+    section: schema['properties'][section]
+    for section in client_specific_sections
+    if section in schema['properties']
+}
+new_schema['properties']['client_1']['properties'] = client_props
+new_schema['properties']['client_2']['properties'] = copy.deepcopy(client_props)
 
 # Add shared sections (not duplicated) to root level
-for section, value in schema['properties'].items():
-    if section not in client_specific_sections:
-        new_schema['properties'][section] = value
+client_specific = set(client_specific_sections)
+new_schema['properties'].update(
+    {section: value for section, value in schema['properties'].items() if section not in client_specific}
+)
 
 # Write the new schema
-with open('e:/f/Brdge AI-Projects/data lab/Data-Lab-Extraction/nest-reducto/schemas/cfr.json', 'w', encoding='utf-8') as f:
-    json.dump(new_schema, f, indent=2, ensure_ascii=False)
+if orjson:
+    # orjson always emits UTF-8, matching ensure_ascii=False
+    with open(SCHEMA_PATH, 'wb') as f:
+        f.write(orjson.dumps(new_schema, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+else:
+    with open(SCHEMA_PATH, 'w', encoding='utf-8') as f:
+        json.dump(new_schema, f, indent=2, ensure_ascii=False)
+        # Match orjson's OPT_APPEND_NEWLINE so both paths write the same bytes
+        f.write('\n')
 
 print("CFR schema restructured successfully!")
 print(f"Client-specific sections moved: {len(client_specific_sections)}")